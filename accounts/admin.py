@@ -6,6 +6,7 @@ class WalletAdmin(admin.ModelAdmin):
     list_display = ['user', 'balance', 'created_at', 'updated_at']
     list_filter = ['created_at', 'updated_at']
     search_fields = ['user__username', 'user__email']
+    list_select_related = ['user']
     readonly_fields = ['created_at', 'updated_at']
 
 @admin.register(WalletTransaction)
@@ -13,6 +14,7 @@ class WalletTransactionAdmin(admin.ModelAdmin):
     list_display = ['wallet', 'transaction_type', 'amount', 'balance_after', 'created_at']
     list_filter = ['transaction_type', 'created_at']
     search_fields = ['wallet__user__username', 'description']
+    list_select_related = ['wallet__user']
     readonly_fields = ['created_at']
 
 @admin.register(WalletPayment)
@@ -20,3 +22,4 @@ class WalletPaymentAdmin(admin.ModelAdmin):
     list_display = ['user', 'amount', 'order_id', 'payment_id', 'status', 'created_at']
     search_fields = ['user__username', 'order_id', 'payment_id']
     list_filter = ['status', 'created_at']
+    list_select_related = ['user']
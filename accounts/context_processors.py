@@ -0,0 +1,14 @@
+from django.utils.functional import SimpleLazyObject
+from .models import Wallet
+
+
+def wallet_balance(request):
+    """Expose the navbar wallet balance without loading the wallet row on every page"""
+    if not request.user.is_authenticated:
+        return {}
+
+    def balance_display():
+        balance = Wallet.get_cached_balance(request.user)
+        return f"₹{balance or 0:,.2f}"
+
+    return {'wallet_balance_display': SimpleLazyObject(balance_display)}
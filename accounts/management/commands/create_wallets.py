@@ -7,16 +7,15 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         users_without_wallets = User.objects.filter(wallet__isnull=True)
-        
-        created_count = 0
-        for user in users_without_wallets:
-            wallet, created = Wallet.objects.get_or_create(user=user)
-            if created:
-                created_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(f'Created wallet for user: {user.username}')
-                )
-        
+
+        # bulk_create skips post_save, so no per-user signal round-trips
+        wallets = [
+            Wallet(user_id=user_id)
+            for user_id in users_without_wallets.values_list('id', flat=True)
+        ]
+        # ignore_conflicts skips wallets created concurrently, and bulk_create still returns them
+        Wallet.objects.bulk_create(wallets, ignore_conflicts=True, batch_size=1000)
+
         self.stdout.write(
-            self.style.SUCCESS(f'Successfully created {created_count} wallets')
+            self.style.SUCCESS(f'Successfully processed {len(wallets)} users without wallets')
         )
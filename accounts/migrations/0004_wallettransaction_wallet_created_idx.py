@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 14:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_walletpayment'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['wallet', '-created_at'], name='wallet_txn_wallet_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-14 14:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_wallettransaction_wallet_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='walletpayment',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'success')), fields=('payment_id',), name='uniq_successful_payment'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def create_missing_wallets(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    Wallet = apps.get_model('accounts', 'Wallet')
+    user_ids = User.objects.filter(wallet__isnull=True).values_list('id', flat=True)
+    Wallet.objects.bulk_create(
+        [Wallet(user_id=user_id) for user_id in user_ids],
+        ignore_conflicts=True,
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_walletpayment_uniq_successful_payment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_wallets, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,22 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.utils import timezone
 from decimal import Decimal
+from django.db.models import F
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+BALANCE_CACHE_TIMEOUT = getattr(settings, 'WALLET_BALANCE_CACHE_TIMEOUT', 60)
+
+def balance_cache_key(user_id):
+    return f'wallet:{user_id}:balance'
+
+def _as_decimal(amount):
+    # Form-cleaned amounts are already Decimal; only convert other numeric types
+    return amount if isinstance(amount, Decimal) else Decimal(str(amount))
+
 class Wallet(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='wallet')
     balance = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
@@ -18,27 +30,52 @@ class Wallet(models.Model):
         """Add funds to wallet"""
         if amount <= 0:
             raise ValueError("Amount must be positive")
-        self.balance += Decimal(str(amount))
-        self.save()
+        Wallet.objects.filter(pk=self.pk).update(
+            balance=F('balance') + _as_decimal(amount),
+            updated_at=timezone.now()
+        )
+        self.refresh_from_db(fields=['balance', 'updated_at'])
+        self._invalidate_cached_balance()
         return self.balance
     
     def deduct_funds(self, amount):
         """Deduct funds from wallet"""
         if amount <= 0:
             raise ValueError("Amount must be positive")
-        if self.balance < Decimal(str(amount)):
+        amount = _as_decimal(amount)
+        updated = Wallet.objects.filter(pk=self.pk, balance__gte=amount).update(
+            balance=F('balance') - amount,
+            updated_at=timezone.now()
+        )
+        if not updated:
             raise ValueError("Insufficient balance")
-        self.balance -= Decimal(str(amount))
-        self.save()
+        self.refresh_from_db(fields=['balance', 'updated_at'])
+        self._invalidate_cached_balance()
         return self.balance
     
     def has_sufficient_balance(self, amount):
         """Check if wallet has sufficient balance"""
-        return self.balance >= Decimal(str(amount))
+        return self.balance >= _as_decimal(amount)
     
     def get_balance_display(self):
         """Get formatted balance display"""
         return f"₹{self.balance:,.2f}"
+    
+    def _invalidate_cached_balance(self):
+        key = balance_cache_key(self.user_id)
+        transaction.on_commit(lambda: cache.delete(key))
+    
+    @classmethod
+    def get_cached_balance(cls, user):
+        """Get a user's balance for display, cached briefly; None if the user has no wallet"""
+        key = balance_cache_key(user.pk)
+        balance = cache.get(key)
+        if balance is None:
+            balance = cls.objects.filter(user=user).values_list('balance', flat=True).first()
+            if balance is None:
+                return None
+            cache.set(key, str(balance), BALANCE_CACHE_TIMEOUT)
+        return Decimal(balance)
 
 class WalletTransaction(models.Model):
     TRANSACTION_TYPES = [
@@ -62,6 +99,9 @@ class WalletTransaction(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['wallet', '-created_at'], name='wallet_txn_wallet_created_idx'),
+        ]
 
 
 class WalletPayment(models.Model):
@@ -83,14 +123,17 @@ class WalletPayment(models.Model):
     def __str__(self):
         return f"{self.user.username} - ₹{self.amount} - {self.status}"
 
-@receiver(post_save, sender=User)
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['payment_id'],
+                condition=models.Q(status='success'),
+                name='uniq_successful_payment'
+            ),
+        ]
+
+@receiver(post_save, sender=User, dispatch_uid='create_user_wallet')
 def create_user_wallet(sender, instance, created, **kwargs):
     """Create a wallet for new users"""
     if created:
         Wallet.objects.create(user=instance)
-
-@receiver(post_save, sender=User)
-def save_user_wallet(sender, instance, **kwargs):
-    """Save wallet when user is saved"""
-    if hasattr(instance, 'wallet'):
-        instance.wallet.save()
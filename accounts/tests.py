@@ -1,3 +1,60 @@
+import hashlib
+import hmac
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+
+from .models import Wallet, WalletPayment, WalletTransaction
+
+
+def sign(order_id, payment_id):
+    return hmac.new(
+        settings.RAZORPAY_KEY_SECRET.encode(),
+        f'{order_id}|{payment_id}'.encode(),
+        hashlib.sha256
+    ).hexdigest()
+
+
+class VerifyPaymentTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('payer', password='pw')
+        self.client.force_login(self.user)
+        WalletPayment.objects.create(user=self.user, amount=Decimal('50'), order_id='order_1')
+
+    def verify(self, order_id, payment_id, signature=None):
+        return self.client.post(reverse('verify_payment'), {
+            'razorpay_order_id': order_id,
+            'razorpay_payment_id': payment_id,
+            'razorpay_signature': signature or sign(order_id, payment_id),
+        })
+
+    def balance(self):
+        return Wallet.objects.get(user=self.user).balance
+
+    def test_replayed_callback_credits_once(self):
+        self.verify('order_1', 'pay_1')
+        self.verify('order_1', 'pay_1')
+
+        self.assertEqual(self.balance(), Decimal('50'))
+        self.assertEqual(WalletTransaction.objects.filter(wallet__user=self.user, transaction_type='deposit').count(), 1)
+        self.assertEqual(WalletPayment.objects.get(order_id='order_1').status, 'success')
+
+    def test_payment_id_cannot_be_reused_for_another_order(self):
+        WalletPayment.objects.create(user=self.user, amount=Decimal('50'), order_id='order_2')
+        self.verify('order_1', 'pay_1')
+
+        self.verify('order_2', 'pay_1')
+
+        self.assertEqual(self.balance(), Decimal('50'))
+        self.assertEqual(WalletPayment.objects.get(order_id='order_2').status, 'created')
+
+    def test_bad_signature_does_not_credit_or_undo_success(self):
+        self.verify('order_1', 'pay_1')
+
+        self.verify('order_1', 'pay_1', signature='0' * 64)
 
-# Create your tests here.
+        self.assertEqual(self.balance(), Decimal('50'))
+        self.assertEqual(WalletPayment.objects.get(order_id='order_1').status, 'success')
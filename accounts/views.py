@@ -1,14 +1,56 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import urlencode
+from functools import lru_cache
+import hashlib
+import hmac
 import razorpay
+from requests.adapters import HTTPAdapter
 from .forms import CustomUserCreationForm, AddFundsForm, WithdrawFundsForm
 from .models import Wallet, WalletTransaction, WalletPayment
 
+@lru_cache(maxsize=1)
+def _get_razorpay_client():
+    """Shared Razorpay client so its HTTP session (and keep-alive) is reused across requests"""
+    client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+    client.session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50))
+    return client
+
+@lru_cache(maxsize=1)
+def _verify_payment_path():
+    # Resolved once per process; the checkout callback path never changes
+    return reverse('verify_payment')
+
+def _is_valid_payment_signature(order_id, payment_id, signature):
+    """Check a checkout signature: HMAC-SHA256 of 'order_id|payment_id' keyed with the API secret"""
+    if not (order_id and payment_id and signature):
+        return False
+    expected = hmac.new(
+        settings.RAZORPAY_KEY_SECRET.encode(),
+        f'{order_id}|{payment_id}'.encode(),
+        hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+TRANSACTIONS_PER_PAGE = 20
+
+def _get_wallet(user, *fields):
+    """Fetch the user's wallet (optionally only some columns); it is created by signal at signup, so only create as a fallback"""
+    queryset = Wallet.objects.only(*fields) if fields else Wallet.objects.all()
+    try:
+        return queryset.get(user=user)
+    except Wallet.DoesNotExist:
+        wallet, _ = Wallet.objects.get_or_create(user=user)
+        return wallet
+
 def register(request):
     if request.method == 'POST':
         form = CustomUserCreationForm(request.POST)
@@ -28,9 +70,12 @@ def profile(request):
 @login_required
 def wallet_view(request):
     """Display user's wallet and transaction history"""
-    wallet, created = Wallet.objects.get_or_create(user=request.user)
+    wallet = _get_wallet(request.user, 'id', 'balance', 'created_at', 'updated_at')
     
-    transactions = wallet.transactions.all()[:10]
+    # The summary table skips the description column
+    transactions = wallet.transactions.only(
+        'wallet', 'transaction_type', 'amount', 'balance_after', 'created_at'
+    ).order_by('-created_at')[:10]
     
     context = {
         'wallet': wallet,
@@ -41,14 +86,14 @@ def wallet_view(request):
 @login_required
 def add_funds(request):
     """Start Razorpay order for adding funds, redirect to checkout"""
-    wallet, created = Wallet.objects.get_or_create(user=request.user)
+    wallet = _get_wallet(request.user)
     
     if request.method == 'POST':
         form = AddFundsForm(request.POST)
         if form.is_valid():
             amount = form.cleaned_data['amount']
             amount_paise = int(amount * 100)
-            client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+            client = _get_razorpay_client()
             rzp_order = client.order.create(dict(amount=amount_paise, currency='INR', payment_capture=1))
             
             WalletPayment.objects.create(
@@ -65,7 +110,7 @@ def add_funds(request):
                 'amount_paise': amount_paise,
                 'order_id': rzp_order.get('id'),
                 'razorpay_key_id': settings.RAZORPAY_KEY_ID,
-                'callback_url': request.build_absolute_uri('/accounts/wallet/verify/'),
+                'callback_url': f'{request.scheme}://{request.get_host()}{_verify_payment_path()}',
                 'user_email': request.user.email or '',
                 'user_name': request.user.get_full_name() or request.user.username,
             }
@@ -92,42 +137,53 @@ def verify_payment(request):
         'razorpay_signature': request.POST.get('razorpay_signature')
     }
     
-    try:
-        client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
-        client.utility.verify_payment_signature(params_dict)
-    except razorpay.errors.SignatureVerificationError:
-        WalletPayment.objects.filter(order_id=params_dict['razorpay_order_id']).update(status='failed')
+    if not _is_valid_payment_signature(
+        params_dict['razorpay_order_id'],
+        params_dict['razorpay_payment_id'],
+        params_dict['razorpay_signature'],
+    ):
+        WalletPayment.objects.filter(
+            order_id=params_dict['razorpay_order_id']
+        ).exclude(status='success').update(status='failed')
         messages.error(request, 'Payment verification failed.')
         return redirect('add_funds')
     
-    payment = WalletPayment.objects.select_for_update().get(order_id=params_dict['razorpay_order_id'])
-    if payment.status == 'success':
+    try:
+        with transaction.atomic():
+            payment = WalletPayment.objects.select_for_update().get(order_id=params_dict['razorpay_order_id'])
+            
+            # Guarded status flip: only one callback can move the order to success,
+            # and the uniq_successful_payment constraint rejects a reused payment id
+            claimed = WalletPayment.objects.filter(pk=payment.pk).exclude(status='success').update(
+                payment_id=params_dict['razorpay_payment_id'],
+                signature=params_dict['razorpay_signature'],
+                status='success',
+                updated_at=timezone.now()
+            )
+            if not claimed:
+                messages.success(request, 'Payment already processed.')
+                return redirect('wallet')
+            
+            wallet, _ = Wallet.objects.select_for_update().get_or_create(user=payment.user)
+            new_balance = wallet.add_funds(payment.amount)
+            WalletTransaction.objects.create(
+                wallet=wallet,
+                transaction_type='deposit',
+                amount=payment.amount,
+                balance_after=new_balance,
+                description=f"Razorpay payment {params_dict['razorpay_payment_id']}"
+            )
+    except IntegrityError:
         messages.success(request, 'Payment already processed.')
         return redirect('wallet')
     
-    payment.payment_id = params_dict['razorpay_payment_id']
-    payment.signature = params_dict['razorpay_signature']
-    payment.status = 'success'
-    
-    with transaction.atomic():
-        payment.save()
-        wallet, _ = Wallet.objects.get_or_create(user=payment.user)
-        new_balance = wallet.add_funds(payment.amount)
-        WalletTransaction.objects.create(
-            wallet=wallet,
-            transaction_type='deposit',
-            amount=payment.amount,
-            balance_after=new_balance,
-            description=f'Razorpay payment {payment.payment_id}'
-        )
-    
     messages.success(request, 'Payment successful! Funds added to your wallet.')
     return redirect('wallet')
 
 @login_required
 def withdraw_funds(request):
     """Withdraw funds from user's wallet"""
-    wallet, created = Wallet.objects.get_or_create(user=request.user)
+    wallet = _get_wallet(request.user)
     
     if request.method == 'POST':
         form = WithdrawFundsForm(request.POST, wallet=wallet)
@@ -136,6 +192,7 @@ def withdraw_funds(request):
             
             try:
                 with transaction.atomic():
+                    wallet = Wallet.objects.select_for_update().get(pk=wallet.pk)
                     new_balance = wallet.deduct_funds(amount)
                     
                     WalletTransaction.objects.create(
@@ -163,15 +220,35 @@ def withdraw_funds(request):
 @login_required
 def transaction_history(request):
     """Display full transaction history"""
-    wallet, created = Wallet.objects.get_or_create(user=request.user)
+    wallet = _get_wallet(request.user)
+    
+    # Keyset pagination on (created_at, id): each page is an index seek, no COUNT(*)
+    transactions = wallet.transactions.order_by('-created_at', '-id')
+    
+    try:
+        before = parse_datetime(request.GET.get('before', ''))
+    except ValueError:
+        before = None
+    before_id = request.GET.get('id', '')
+    is_first_page = not (before and before_id.isdigit())
+    if not is_first_page:
+        transactions = transactions.filter(
+            Q(created_at__lt=before) | Q(created_at=before, id__lt=int(before_id))
+        )
+    
+    page = list(transactions[:TRANSACTIONS_PER_PAGE + 1])
+    has_next = len(page) > TRANSACTIONS_PER_PAGE
+    page = page[:TRANSACTIONS_PER_PAGE]
     
-    transactions = wallet.transactions.all()
-    paginator = Paginator(transactions, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    next_query = None
+    if has_next:
+        last = page[-1]
+        next_query = urlencode({'before': last.created_at.isoformat(), 'id': last.id})
     
     context = {
         'wallet': wallet,
-        'page_obj': page_obj,
+        'transactions': page,
+        'is_first_page': is_first_page,
+        'next_query': next_query,
     }
     return render(request, 'accounts/transaction_history.html', context)
@@ -49,6 +49,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'accounts.context_processors.wallet_balance',
             ],
         },
     },
@@ -59,10 +60,16 @@ WSGI_APPLICATION = 'auction_site.wsgi.application'
 # Database
 
 
+# Keep connections open between requests instead of reconnecting on every hit;
+# health checks drop connections the server has closed in the meantime.
+CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -75,9 +82,34 @@ DATABASES = {
 #         'PASSWORD': os.environ.get('RDS_PASSWORD', 'onlinebidding12345'),
 #         'HOST': os.environ.get('RDS_HOSTNAME', 'onlinebidding.csfcsyq6i9y9.us-east-1.rds.amazonaws.com'),
 #         'PORT': os.environ.get('RDS_PORT', '5432'),
+#         'CONN_MAX_AGE': CONN_MAX_AGE,
+#         'CONN_HEALTH_CHECKS': True,
 #     }
 # }
 
+# Set REDIS_URL in production so every worker shares one cache and the on-commit
+# invalidations reach all of them. Without it each process keeps its own
+# memory cache: categories and auction counts may then lag by their short
+# timeouts, and wallet balances are not cached at all.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds the navbar balance is cached; 0 disables caching (a per-process cache would serve stale money)
+WALLET_BALANCE_CACHE_TIMEOUT = 60 if REDIS_URL else 0
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -113,6 +145,24 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploaded images live on the local filesystem by default. Setting
+# AWS_STORAGE_BUCKET_NAME stores them in S3 instead (requires django-storages),
+# and AWS_S3_CUSTOM_DOMAIN serves them from a CDN so image bytes skip the app servers.
+AWS_STORAGE_BUCKET_NAME = os.environ.get('AWS_STORAGE_BUCKET_NAME')
+AWS_S3_CUSTOM_DOMAIN = os.environ.get('AWS_S3_CUSTOM_DOMAIN')
+
+STORAGES = {
+    'default': {
+        'BACKEND': (
+            'storages.backends.s3.S3Storage' if AWS_STORAGE_BUCKET_NAME
+            else 'django.core.files.storage.FileSystemStorage'
+        ),
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -10,11 +10,30 @@ class AuctionItemAdmin(admin.ModelAdmin):
     list_display = ['title', 'seller', 'starting_price', 'current_price', 'status', 'created_at']
     list_filter = ['status', 'category', 'created_at']
     search_fields = ['title', 'description']
+    list_select_related = ['seller']
 
 @admin.register(Bid)
 class BidAdmin(admin.ModelAdmin):
     list_display = ['item', 'bidder', 'amount', 'timestamp']
     list_filter = ['timestamp']
+    list_select_related = ['item', 'bidder']
+    ordering = ['-timestamp']
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Admin edits bypass place_bid, so resync the auction's denormalized leader
+        obj.item.update_current_price()
+    
+    def delete_model(self, request, obj):
+        item = obj.item
+        super().delete_model(request, obj)
+        item.update_current_price()
+
+    def delete_queryset(self, request, queryset):
+        items = list(AuctionItem.objects.filter(bids__in=queryset).distinct())
+        super().delete_queryset(request, queryset)
+        for item in items:
+            item.update_current_price()
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
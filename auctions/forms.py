@@ -18,9 +18,10 @@ class AuctionItemForm(forms.ModelForm):
     
     def clean_end_time(self):
         end_time = self.cleaned_data['end_time']
-        if end_time <= timezone.now():
+        now = timezone.now()
+        if end_time <= now:
             raise forms.ValidationError("End time must be in the future.")
-        if end_time <= timezone.now() + timedelta(hours=1):
+        if end_time <= now + timedelta(hours=1):
             raise forms.ValidationError("Auction must run for at least 1 hour.")
         return end_time
     
@@ -54,9 +55,9 @@ class BidForm(forms.ModelForm):
         
         # Check minimum bid if auction is provided
         if self.auction:
-            current_highest = self.auction.bids.filter(is_deleted=False).order_by('-amount').first()
-            if current_highest:
-                min_bid = current_highest.amount + 1
+            # current_price tracks the denormalized leader, so no bid query is needed
+            if self.auction.highest_bid_id:
+                min_bid = self.auction.current_price + 1
             else:
                 min_bid = self.auction.starting_price
             
@@ -1,25 +1,13 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from auctions.models import AuctionItem
+from auctions.services import auto_close_expired_auctions
 
 class Command(BaseCommand):
-    help = 'Close expired auctions and set winners'
+    help = 'Close expired auctions and set winners (run periodically, e.g. every minute from cron)'
     
     def handle(self, *args, **options):
-        now = timezone.now()
-        expired_auctions = AuctionItem.objects.filter(
-            end_time__lte=now,
-            status='active'
-        )
-        
-        for auction in expired_auctions:
-            auction.status = 'closed'
-            # Find the highest bidder
-            highest_bid = auction.bids.order_by('-amount').first()
-            if highest_bid:
-                auction.winner = highest_bid.bidder
-            auction.save()
+        # Same sweep as the request path; sellers are paid in the same transaction as the close
+        closed_count = len(auto_close_expired_auctions())
             
         self.stdout.write(
-            self.style.SUCCESS(f'Closed {expired_auctions.count()} expired auctions')
+            self.style.SUCCESS(f'Closed {closed_count} expired auctions')
         )
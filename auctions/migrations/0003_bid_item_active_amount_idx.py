@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-14 14:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0002_auctionitem_original_end_time_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['item', 'is_deleted', '-amount'], name='bid_item_active_amount_idx'),
+        ),
+    ]
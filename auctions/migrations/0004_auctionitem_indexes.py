@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-14 14:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0003_bid_item_active_amount_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(fields=['status', 'end_time'], name='auction_status_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(fields=['seller', '-created_at'], name='auction_seller_created_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-14 14:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_highest_bid(apps, schema_editor):
+    AuctionItem = apps.get_model('auctions', 'AuctionItem')
+    Bid = apps.get_model('auctions', 'Bid')
+    top_bid = Bid.objects.filter(
+        item=OuterRef('pk'), is_deleted=False
+    ).order_by('-amount').values('pk')[:1]
+    AuctionItem.objects.update(highest_bid=Subquery(top_bid))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0005_auction_status_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auctionitem',
+            name='highest_bid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='auctions.bid'),
+        ),
+        migrations.RunPython(backfill_highest_bid, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+from django.db import migrations, models
+
+STATUS_CODES = {
+    'active': 0,
+    'closed': 1,
+    'pending': 2,
+    'extended': 3,
+}
+
+STATUS_CHOICES = [(0, 'Active'), (1, 'Closed'), (2, 'Pending'), (3, 'Extended')]
+
+
+def forwards(apps, schema_editor):
+    AuctionItem = apps.get_model('auctions', 'AuctionItem')
+    for name, code in STATUS_CODES.items():
+        AuctionItem.objects.filter(status=name).update(status_code=code)
+
+
+def backwards(apps, schema_editor):
+    AuctionItem = apps.get_model('auctions', 'AuctionItem')
+    for name, code in STATUS_CODES.items():
+        AuctionItem.objects.filter(status_code=code).update(status=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0006_auctionitem_highest_bid'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auctionitem',
+            name='auction_status_end_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auctionitem',
+            name='auction_status_created_idx',
+        ),
+        migrations.AddField(
+            model_name='auctionitem',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(choices=STATUS_CHOICES, default=0),
+        ),
+        migrations.RunPython(forwards, backwards),
+        migrations.RemoveField(
+            model_name='auctionitem',
+            name='status',
+        ),
+        migrations.RenameField(
+            model_name='auctionitem',
+            old_name='status_code',
+            new_name='status',
+        ),
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(fields=['status', 'end_time'], name='auction_status_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(fields=['status', '-created_at'], name='auction_status_created_idx'),
+        ),
+    ]
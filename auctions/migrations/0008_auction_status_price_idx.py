@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-14 14:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0007_auctionitem_status_smallint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(fields=['status', 'current_price'], name='auction_status_price_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 14:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0008_auction_status_price_idx'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='bid',
+            options={},
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-14 14:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0009_bid_remove_default_ordering'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(condition=models.Q(('status__in', [0, 3])), fields=['-created_at'], name='auction_open_created_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-14 14:34
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_bid_count(apps, schema_editor):
+    AuctionItem = apps.get_model('auctions', 'AuctionItem')
+    Bid = apps.get_model('auctions', 'Bid')
+    live_bids = Bid.objects.filter(
+        item=OuterRef('pk'), is_deleted=False
+    ).order_by().values('item').annotate(n=Count('pk')).values('n')
+    AuctionItem.objects.update(bid_count=Coalesce(Subquery(live_bids), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0010_auction_open_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auctionitem',
+            name='bid_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_bid_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-14 14:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0011_auctionitem_bid_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auctionitem',
+            index=models.Index(fields=['winner', '-end_time'], name='auction_winner_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['item', 'is_deleted', '-timestamp'], name='bid_item_active_time_idx'),
+        ),
+    ]
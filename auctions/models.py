@@ -1,8 +1,32 @@
+import hashlib
 from django.db import models
+from django.core.cache import cache
+from django.db.models import Count, F, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.urls import reverse
 
+CATEGORIES_CACHE_KEY = 'categories:v1'
+CATEGORIES_CACHE_TIMEOUT = 300
+
+AUCTION_COUNT_CACHE_TIMEOUT = 60
+AUCTION_COUNT_GENERATION_KEY = 'auction_list_count:generation'
+
+def auction_count_cache_key(*filters):
+    """Cache key for an auction_list result count, scoped to the current generation"""
+    generation = cache.get_or_set(AUCTION_COUNT_GENERATION_KEY, 0, None)
+    digest = hashlib.md5(repr(filters).encode()).hexdigest()
+    return f'auction_list_count:{generation}:{digest}'
+
+def invalidate_auction_counts():
+    """Make every cached auction_list count stale"""
+    try:
+        cache.incr(AUCTION_COUNT_GENERATION_KEY)
+    except ValueError:
+        # No generation stored yet, so nothing has been cached under it
+        pass
+
 class Category(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
@@ -10,16 +34,37 @@ class Category(models.Model):
     def __str__(self):
         return self.name
     
+    @classmethod
+    def get_cached_list(cls):
+        """Get all categories for navigation, cached until a category changes"""
+        return cache.get_or_set(
+            CATEGORIES_CACHE_KEY,
+            lambda: list(cls.objects.only('id', 'name')),
+            CATEGORIES_CACHE_TIMEOUT
+        )
+    
     class Meta:
         verbose_name_plural = "Categories"
 
+# Auction status codes live at module level so AuctionItem.Meta can use them too
+AUCTION_ACTIVE = 0
+AUCTION_CLOSED = 1
+AUCTION_PENDING = 2
+AUCTION_EXTENDED = 3
+AUCTION_OPEN_STATUSES = [AUCTION_ACTIVE, AUCTION_EXTENDED]
+
 class AuctionItem(models.Model):
+    ACTIVE = AUCTION_ACTIVE
+    CLOSED = AUCTION_CLOSED
+    PENDING = AUCTION_PENDING
+    EXTENDED = AUCTION_EXTENDED
     AUCTION_STATUS = [
-        ('active', 'Active'),
-        ('closed', 'Closed'),
-        ('pending', 'Pending'),
-        ('extended', 'Extended'),
+        (ACTIVE, 'Active'),
+        (CLOSED, 'Closed'),
+        (PENDING, 'Pending'),
+        (EXTENDED, 'Extended'),
     ]
+    OPEN_STATUSES = AUCTION_OPEN_STATUSES
     
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -31,9 +76,13 @@ class AuctionItem(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     original_end_time = models.DateTimeField()
     end_time = models.DateTimeField()
-    status = models.CharField(max_length=10, choices=AUCTION_STATUS, default='active')
+    status = models.PositiveSmallIntegerField(choices=AUCTION_STATUS, default=ACTIVE)
     winner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='won_items')
     time_extensions = models.PositiveIntegerField(default=0)
+    # Denormalized leader, kept current by the Bid post_save signal and update_current_price
+    highest_bid = models.ForeignKey('Bid', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    # Live (non-deleted) bids, incremented by place_bid and recounted by update_current_price
+    bid_count = models.PositiveIntegerField(default=0)
     
     def __str__(self):
         return self.title
@@ -41,12 +90,17 @@ class AuctionItem(models.Model):
     def get_absolute_url(self):
         return reverse('auction_detail', kwargs={'pk': self.pk})
     
+    def _now(self):
+        """Current time, pinned for the whole render when a view sets _cached_now"""
+        return getattr(self, '_cached_now', None) or timezone.now()
+    
     def is_active(self):
-        return self.status in ['active', 'extended'] and timezone.now() < self.end_time
+        return self.status in self.OPEN_STATUSES and self._now() < self.end_time
     
     def time_remaining(self):
-        if self.end_time > timezone.now():
-            return self.end_time - timezone.now()
+        now = self._now()
+        if self.end_time > now:
+            return self.end_time - now
         return None
     
     def get_time_remaining_display(self):
@@ -68,22 +122,23 @@ class AuctionItem(models.Model):
             return f"{minutes} minute{'s' if minutes != 1 else ''} remaining"
     
     def update_current_price(self):
-        highest_bid = self.bids.filter(is_deleted=False).order_by('-amount').first()
-        if highest_bid:
-            self.current_price = highest_bid.amount
-        else:
-            self.current_price = self.starting_price
-        self.save()
+        highest_bids = self.bids.filter(is_deleted=False).order_by('-amount')
+        AuctionItem.objects.filter(pk=self.pk).update(
+            current_price=Coalesce(Subquery(highest_bids.values('amount')[:1]), F('starting_price')),
+            highest_bid=Subquery(highest_bids.values('pk')[:1]),
+            bid_count=Coalesce(Subquery(highest_bids.order_by().values('item').annotate(n=Count('pk')).values('n')), 0)
+        )
+        self.refresh_from_db(fields=['current_price', 'highest_bid', 'bid_count'])
     
     def can_extend_time(self):
-        return self.status == 'active' and self.time_extensions < 3
+        return self.status == self.ACTIVE and self.time_extensions < 3
     def can_be_managed_by_seller(self):
         """Check if auction can be managed by seller"""
         return True
 
     def can_be_ended_early(self):
         """Check if auction can be ended early by seller"""
-        return self.status == 'active'
+        return self.status == self.ACTIVE
 
     def can_modify_description(self):
         """Check if description can be modified"""
@@ -95,13 +150,16 @@ class AuctionItem(models.Model):
 
     def can_be_deleted_by_seller(self):
         """Check if auction can be deleted by seller within 10 minutes"""
-        if self.status != 'active':
+        if self.status != self.ACTIVE:
             return False
     
         time_limit = self.created_at + timezone.timedelta(minutes=10)
-        within_time_limit = timezone.now() < time_limit
+        within_time_limit = self._now() < time_limit
     
-        has_bids = self.bids.filter(is_deleted=False).exists()
+        # Views may annotate has_bids to fold this check into the initial SELECT
+        has_bids = getattr(self, 'has_bids', None)
+        if has_bids is None:
+            has_bids = self.bids.filter(is_deleted=False).exists()
     
         return within_time_limit and not has_bids
 
@@ -114,6 +172,26 @@ class AuctionItem(models.Model):
     def can_extend_time_property(self):
         """Property version for template access"""
         return self.can_extend_time()
+    
+    class Meta:
+        indexes = [
+            # Expiry sweep and the end_time sort on auction_list
+            models.Index(fields=['status', 'end_time'], name='auction_status_end_idx'),
+            # Default newest-first order on home and auction_list
+            models.Index(fields=['status', '-created_at'], name='auction_status_created_idx'),
+            # Price sorts on auction_list
+            models.Index(fields=['status', 'current_price'], name='auction_status_price_idx'),
+            # my_auctions selling tab
+            models.Index(fields=['seller', '-created_at'], name='auction_seller_created_idx'),
+            # my_auctions won tab
+            models.Index(fields=['winner', '-end_time'], name='auction_winner_end_idx'),
+            # Newest open auctions for the home and list pages; same predicate as OPEN_STATUSES filters
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(status__in=AUCTION_OPEN_STATUSES),
+                name='auction_open_created_idx'
+            ),
+        ]
 
 
 class Bid(models.Model):
@@ -130,14 +208,14 @@ class Bid(models.Model):
     
     def can_be_deleted(self):
         """Check if bid can be deleted by bidder"""
-        if self == self.item.bids.filter(is_deleted=False).order_by('-amount').first():
+        if self.pk == self.item.highest_bid_id:
             return False
         
         if not self.item.is_active():
             return False
         
         time_limit = self.timestamp + timezone.timedelta(minutes=5)
-        return timezone.now() < time_limit
+        return self.item._now() < time_limit
 
     @property
     def can_be_deleted_property(self):
@@ -145,13 +223,24 @@ class Bid(models.Model):
         return self.can_be_deleted()
     
     def soft_delete(self):
+        """Mark the bid deleted and resync the auction; False if it was already deleted"""
+        deleted_at = timezone.now()
+        # Guarded UPDATE so two concurrent deletes of the same bid cannot both succeed
+        claimed = Bid.objects.filter(pk=self.pk, is_deleted=False).update(is_deleted=True, deleted_at=deleted_at)
+        if not claimed:
+            return False
         self.is_deleted = True
-        self.deleted_at = timezone.now()
-        self.save()
+        self.deleted_at = deleted_at
         self.item.update_current_price()
+        return True
     
     class Meta:
-        ordering = ['-timestamp']
+        indexes = [
+            # Highest live bid: update_current_price, the winner subqueries and BidForm
+            models.Index(fields=['item', 'is_deleted', '-amount'], name='bid_item_active_amount_idx'),
+            # Most recent live bids: the auction_detail prefetch and get_recent_bids
+            models.Index(fields=['item', 'is_deleted', '-timestamp'], name='bid_item_active_time_idx'),
+        ]
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, IntegerField, OuterRef, Subquery, Value, When
+from django.utils import timezone
+from .models import AuctionItem, Bid, invalidate_auction_counts
+from accounts.models import Wallet, WalletTransaction, balance_cache_key
+
+
+# Minimum seconds between request-triggered sweeps; the close_expired_auctions command runs unthrottled
+SWEEP_INTERVAL = 30
+
+
+def _credit_sellers(sold):
+    """Pay sellers for closed auctions with one wallet update and one ledger insert per batch"""
+    seller_ids = {seller_id for _, seller_id, _, _, _ in sold}
+    wallets = Wallet.objects.select_for_update().in_bulk(seller_ids, field_name='user_id')
+    missing = seller_ids - wallets.keys()
+    if missing:
+        Wallet.objects.bulk_create([Wallet(user_id=user_id) for user_id in missing], ignore_conflicts=True)
+        wallets = Wallet.objects.select_for_update().in_bulk(seller_ids, field_name='user_id')
+    
+    now = timezone.now()
+    ledger = []
+    for _, seller_id, title, _, amount in sold:
+        wallet = wallets[seller_id]
+        wallet.balance += amount
+        wallet.updated_at = now
+        ledger.append(WalletTransaction(
+            wallet=wallet,
+            transaction_type='auction_sold',
+            amount=amount,
+            balance_after=wallet.balance,
+            description=f'Auction sold: {title}'
+        ))
+    
+    Wallet.objects.bulk_update(wallets.values(), ['balance', 'updated_at'])
+    WalletTransaction.objects.bulk_create(ledger)
+    cache_keys = [balance_cache_key(user_id) for user_id in seller_ids]
+    transaction.on_commit(lambda: cache.delete_many(cache_keys))
+
+
+def _close_auctions(auctions):
+    """Close the open auctions in the queryset, set winners and pay sellers; returns {auction_id: winner_id}"""
+    top_bids = Bid.objects.filter(item=OuterRef('pk'), is_deleted=False).order_by('-amount')
+    
+    with transaction.atomic():
+        # Lock the rows so concurrent closes cannot close and pay out the same auction twice
+        closing = list(
+            auctions.select_for_update().filter(
+                status__in=AuctionItem.OPEN_STATUSES
+            ).annotate(
+                winner_bidder_id=Subquery(top_bids.values('bidder_id')[:1]),
+                winning_amount=Subquery(top_bids.values('amount')[:1])
+            ).values_list('pk', 'seller_id', 'title', 'winner_bidder_id', 'winning_amount')
+        )
+        if not closing:
+            return {}
+        
+        # One UPDATE for every closed auction; winners come from the rows read under the lock,
+        # so they match the payouts below
+        AuctionItem.objects.filter(pk__in=[row[0] for row in closing]).update(
+            status=AuctionItem.CLOSED,
+            winner=Case(
+                *[When(pk=auction_id, then=Value(winner_id)) for auction_id, _, _, winner_id, _ in closing if winner_id],
+                default=None,
+                output_field=IntegerField()
+            )
+        )
+        transaction.on_commit(invalidate_auction_counts)
+        
+        sold = [row for row in closing if row[3] is not None]
+        if sold:
+            _credit_sellers(sold)
+    
+    return {row[0]: row[3] for row in closing}
+
+
+def auto_close_expired_auctions():
+    """Helper function to auto-close expired auctions; returns {auction_id: winner_id} for those closed"""
+    return _close_auctions(AuctionItem.objects.filter(end_time__lte=timezone.now()))
+
+
+def close_auction(auction_id):
+    """End one auction early; returns False if it was already closed"""
+    return auction_id in _close_auctions(AuctionItem.objects.filter(pk=auction_id))
+
+
+def maybe_close_expired_auctions():
+    """Run the expired-auction sweep at most once per SWEEP_INTERVAL across requests"""
+    # cache.add only succeeds for the first caller until the key expires
+    if cache.add('auction_sweep_lock', 1, timeout=SWEEP_INTERVAL):
+        auto_close_expired_auctions()
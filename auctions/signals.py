@@ -1,18 +1,27 @@
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.utils import timezone
-from .models import AuctionItem, Bid
+from .models import CATEGORIES_CACHE_KEY, AuctionItem, Category, invalidate_auction_counts
 
-@receiver(post_save, sender=Bid)
-def update_auction_winner(sender, instance, created, **kwargs):
-    """Update auction winner when it ends"""
+# Closing ended auctions is not done per bid; the close_expired_auctions
+# command closes every expired auction in one UPDATE on a schedule.
+# The highest bid is tracked by place_bid's guarded UPDATE and
+# AuctionItem.update_current_price, not by a Bid receiver.
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_cached_categories(sender, **kwargs):
+    """Drop the cached category list once the change is committed"""
+    transaction.on_commit(lambda: cache.delete(CATEGORIES_CACHE_KEY))
+
+@receiver(post_save, sender=AuctionItem)
+def invalidate_counts_on_create(sender, instance, created, **kwargs):
+    """Drop cached auction_list counts once a new auction is committed"""
     if created:
-        auction = instance.item
-        # Check if auction has ended
-        if timezone.now() >= auction.end_time and auction.status == 'active':
-            auction.status = 'closed'
-            # Set the highest bidder as winner
-            highest_bid = auction.bids.order_by('-amount').first()
-            if highest_bid:
-                auction.winner = highest_bid.bidder
-            auction.save()
+        transaction.on_commit(invalidate_auction_counts)
+
+@receiver(post_delete, sender=AuctionItem)
+def invalidate_counts_on_delete(sender, **kwargs):
+    """Drop cached auction_list counts once a deleted auction is committed"""
+    transaction.on_commit(invalidate_auction_counts)
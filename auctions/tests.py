@@ -1,3 +1,167 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Wallet, WalletTransaction
+from .models import AuctionItem, Bid, Category
+from .services import auto_close_expired_auctions
+
+
+class AuctionTestCase(TestCase):
+    def setUp(self):
+        self.seller = User.objects.create_user('seller', password='pw')
+        self.bidder = User.objects.create_user('bidder', password='pw')
+        self.rival = User.objects.create_user('rival', password='pw')
+        for user in (self.bidder, self.rival):
+            Wallet.objects.get(user=user).add_funds(Decimal('1000'))
+        self.category = Category.objects.create(name='Art')
+        self.auction = self.create_auction()
+
+    def create_auction(self, ends_in=timedelta(days=1)):
+        end_time = timezone.now() + ends_in
+        return AuctionItem.objects.create(
+            title='Painting',
+            description='Oil on canvas',
+            category=self.category,
+            seller=self.seller,
+            starting_price=Decimal('10'),
+            current_price=Decimal('10'),
+            original_end_time=end_time,
+            end_time=end_time
+        )
+
+    def place_bid(self, user, amount, auction=None):
+        auction = auction or self.auction
+        self.client.force_login(user)
+        return self.client.post(reverse('place_bid', args=[auction.pk]), {'amount': str(amount)})
+
+    def balance(self, user):
+        return Wallet.objects.get(user=user).balance
+
+
+class PlaceBidTests(AuctionTestCase):
+    def test_winning_bid_updates_auction_and_debits_wallet(self):
+        self.place_bid(self.bidder, 20)
+
+        self.auction.refresh_from_db()
+        bid = Bid.objects.get(item=self.auction)
+        self.assertEqual(self.auction.current_price, Decimal('20'))
+        self.assertEqual(self.auction.highest_bid_id, bid.pk)
+        self.assertEqual(self.auction.bid_count, 1)
+        self.assertEqual(self.balance(self.bidder), Decimal('980'))
+
+    def test_equal_or_lower_bid_is_rejected_without_debit(self):
+        self.place_bid(self.rival, 30)
+
+        self.place_bid(self.bidder, 30)
+        self.place_bid(self.bidder, 25)
+
+        self.assertFalse(Bid.objects.filter(bidder=self.bidder).exists())
+        self.assertEqual(self.balance(self.bidder), Decimal('1000'))
+        self.assertFalse(WalletTransaction.objects.filter(wallet__user=self.bidder, transaction_type='bid_placed').exists())
+
+    def test_bid_below_current_price_is_rejected_when_form_check_is_stale(self):
+        self.place_bid(self.rival, 30)
+        # Simulate a higher bid landing after the form validated against the old price
+        AuctionItem.objects.filter(pk=self.auction.pk).update(current_price=Decimal('100'))
+
+        self.place_bid(self.bidder, 50)
+
+        self.assertFalse(Bid.objects.filter(bidder=self.bidder).exists())
+        self.assertEqual(self.balance(self.bidder), Decimal('1000'))
+
+
+class DeleteBidTests(AuctionTestCase):
+    def test_withdrawn_bid_is_refunded_once(self):
+        self.place_bid(self.bidder, 20)
+        self.place_bid(self.rival, 30)
+        bid = Bid.objects.get(bidder=self.bidder)
+
+        self.client.force_login(self.bidder)
+        self.client.post(reverse('delete_bid', args=[bid.pk]))
+        self.client.post(reverse('delete_bid', args=[bid.pk]))
+
+        self.assertEqual(self.balance(self.bidder), Decimal('1000'))
+        refunds = WalletTransaction.objects.filter(wallet__user=self.bidder, transaction_type='bid_refund')
+        self.assertEqual(refunds.count(), 1)
+
+    def test_soft_delete_of_already_deleted_bid_reports_failure(self):
+        self.place_bid(self.bidder, 20)
+        stale = Bid.objects.get(bidder=self.bidder)
+        self.assertTrue(Bid.objects.get(pk=stale.pk).soft_delete())
+
+        self.assertFalse(stale.soft_delete())
+
+    def test_highest_bid_cannot_be_withdrawn(self):
+        self.place_bid(self.bidder, 20)
+        bid = Bid.objects.get(bidder=self.bidder)
+
+        self.client.post(reverse('delete_bid', args=[bid.pk]))
+
+        bid.refresh_from_db()
+        self.assertFalse(bid.is_deleted)
+        self.assertEqual(self.balance(self.bidder), Decimal('980'))
+
+
+class CloseExpiredAuctionsTests(AuctionTestCase):
+    def expire(self, *auctions):
+        AuctionItem.objects.filter(pk__in=[auction.pk for auction in auctions]).update(
+            end_time=timezone.now() - timedelta(minutes=1)
+        )
+
+    def test_sweep_sets_winner_and_credits_each_seller_once(self):
+        second = self.create_auction()
+        unsold = self.create_auction()
+        self.place_bid(self.bidder, 20)
+        self.place_bid(self.rival, 30)
+        self.place_bid(self.bidder, 15, auction=second)
+        self.expire(self.auction, second, unsold)
+
+        closed = auto_close_expired_auctions()
+        auto_close_expired_auctions()
+
+        self.assertEqual(closed, {self.auction.pk: self.rival.pk, second.pk: self.bidder.pk, unsold.pk: None})
+        for auction, winner in ((self.auction, self.rival), (second, self.bidder), (unsold, None)):
+            auction.refresh_from_db()
+            self.assertEqual(auction.status, AuctionItem.CLOSED)
+            self.assertEqual(auction.winner, winner)
+        self.assertEqual(self.balance(self.seller), Decimal('45'))
+        sales = WalletTransaction.objects.filter(wallet__user=self.seller, transaction_type='auction_sold')
+        self.assertEqual(sorted(sales.values_list('amount', flat=True)), [Decimal('15'), Decimal('30')])
+
+    def test_withdrawn_bid_does_not_win(self):
+        self.place_bid(self.bidder, 20)
+        self.place_bid(self.rival, 30)
+        Bid.objects.get(bidder=self.rival).soft_delete()
+        self.expire(self.auction)
+
+        auto_close_expired_auctions()
+
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.winner, self.bidder)
+        self.assertEqual(self.balance(self.seller), Decimal('20'))
+
+
+class EndAuctionTests(AuctionTestCase):
+    def end_auction(self):
+        self.client.force_login(self.seller)
+        return self.client.post(reverse('manage_auction', args=[self.auction.pk]), {'action': 'end_auction'})
+
+    def test_ending_early_sets_winner_and_credits_seller_once(self):
+        self.place_bid(self.bidder, 20)
+        self.place_bid(self.rival, 30)
+
+        self.end_auction()
+        self.end_auction()
+        auto_close_expired_auctions()
 
-# Create your tests here.
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.status, AuctionItem.CLOSED)
+        self.assertEqual(self.auction.winner, self.rival)
+        self.assertEqual(self.balance(self.seller), Decimal('30'))
+        sales = WalletTransaction.objects.filter(wallet__user=self.seller, transaction_type='auction_sold')
+        self.assertEqual(sales.count(), 1)
@@ -2,59 +2,59 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Q, Max
+from django.utils.functional import cached_property
+from django.db.models import DurationField, Exists, ExpressionWrapper, F, OuterRef, Q, Max, Prefetch
+from django.db.models.functions import Now
 from django.http import JsonResponse
 from django.db import transaction
 from datetime import timedelta
-from .models import AuctionItem, Category, Bid, AuctionExtension
+from .models import AuctionItem, Category, Bid, AuctionExtension, AUCTION_COUNT_CACHE_TIMEOUT, auction_count_cache_key
 from .forms import AuctionItemForm, BidForm, ExtendTimeForm
+from .services import auto_close_expired_auctions, close_auction, maybe_close_expired_auctions
 from accounts.models import Wallet, WalletTransaction
 
 
-def auto_close_expired_auctions():
-    """Helper function to auto-close expired auctions"""
-    expired_auctions = AuctionItem.objects.filter(
-        status__in=['active', 'extended'],
-        end_time__lte=timezone.now()
-    )
+# Seconds the polled auction status payload is shared between clients
+STATUS_CACHE_TIMEOUT = 2
+
+# Seconds the polled recent-bids list is shared; placing or withdrawing a bid clears it sooner
+RECENT_BIDS_CACHE_TIMEOUT = 3
+
+
+def recent_bids_cache_key(auction_id):
+    return f'recent_bids:{auction_id}'
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that reuses a cached COUNT(*) for the same filters"""
     
-    for auction in expired_auctions:
-        auction.status = 'closed'
-        highest_bid = auction.bids.filter(is_deleted=False).order_by('-amount').first()
-        if highest_bid:
-            auction.winner = highest_bid.bidder
-            try:
-                from accounts.models import Wallet, WalletTransaction
-                from django.db import transaction as dbtx
-                with dbtx.atomic():
-                    seller_wallet, _ = Wallet.objects.get_or_create(user=auction.seller)
-                    new_balance = seller_wallet.add_funds(highest_bid.amount)
-                    WalletTransaction.objects.create(
-                        wallet=seller_wallet,
-                        transaction_type='auction_sold',
-                        amount=highest_bid.amount,
-                        balance_after=new_balance,
-                        description=f'Auction sold: {auction.title}'
-                    )
-            except Exception:
-                pass
-        auction.save()
+    def __init__(self, object_list, per_page, cache_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
     
-    return expired_auctions.count()
+    @cached_property
+    def count(self):
+        return cache.get_or_set(self.cache_key, self.object_list.count, AUCTION_COUNT_CACHE_TIMEOUT)
+
+
+# Columns rendered by the auction cards on the home and list pages
+AUCTION_CARD_FIELDS = ('id', 'title', 'description', 'image', 'current_price', 'end_time', 'status', 'created_at')
 
 
 def home(request):
-    auto_close_expired_auctions()
+    maybe_close_expired_auctions()
     
     active_auctions = AuctionItem.objects.filter(
-        status__in=['active', 'extended'],
+        status__in=AuctionItem.OPEN_STATUSES,
         end_time__gt=timezone.now()
-    ).order_by('-created_at')[:6]
+    ).only(*AUCTION_CARD_FIELDS).order_by('-created_at')[:6]
     
-    categories = Category.objects.all()
+    categories = Category.get_cached_list()
     
-    total_auctions = AuctionItem.objects.filter(status__in=['active', 'extended']).count()
+    # Two single-table counts: joining auctions to bids for one aggregate would scan every bid
+    total_auctions = AuctionItem.objects.filter(status__in=AuctionItem.OPEN_STATUSES).count()
     total_bids = Bid.objects.filter(is_deleted=False).count()
     
     context = {
@@ -67,11 +67,14 @@ def home(request):
 
 
 def auction_list(request):
-    auto_close_expired_auctions()
+    maybe_close_expired_auctions()
     
-    auctions = AuctionItem.objects.filter(
-        status__in=['active', 'extended'],
+    # The filter already guarantees the auction is active; the time left is computed by the database
+    auctions = AuctionItem.objects.select_related('seller').filter(
+        status__in=AuctionItem.OPEN_STATUSES,
         end_time__gt=timezone.now()
+    ).only(*AUCTION_CARD_FIELDS, 'seller__username').annotate(
+        time_left=ExpressionWrapper(F('end_time') - Now(), output_field=DurationField())
     ).order_by('-created_at')
     
     query = request.GET.get('q')
@@ -84,15 +87,17 @@ def auction_list(request):
     if category_id:
         auctions = auctions.filter(category_id=category_id)
     
+    # Each allowed sort is backed by a (status, <column>) index on AuctionItem
     sort_by = request.GET.get('sort', '-created_at')
     if sort_by in ['-created_at', 'current_price', '-current_price', 'end_time']:
         auctions = auctions.order_by(sort_by)
     
-    paginator = Paginator(auctions, 12)
+    # Sorting does not change the count, so only the filters go into the key
+    paginator = CachedCountPaginator(auctions, 12, auction_count_cache_key(query, category_id))
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    categories = Category.objects.all()
+    categories = Category.get_cached_list()
     
     context = {
         'page_obj': page_obj,
@@ -105,18 +110,26 @@ def auction_list(request):
 
 
 def auction_detail(request, pk):
-    auction = get_object_or_404(AuctionItem, pk=pk)
-    
-    auto_close_expired_auctions()
+    maybe_close_expired_auctions()
     
-    auction.refresh_from_db()
+    recent_bids = Prefetch(
+        'bids',
+        queryset=Bid.objects.filter(is_deleted=False).select_related('bidder').order_by('-timestamp')[:10],
+        to_attr='recent_bids'
+    )
+    auction = get_object_or_404(
+        AuctionItem.objects.select_related(
+            'seller', 'category', 'winner', 'highest_bid__bidder'
+        ).prefetch_related(recent_bids),
+        pk=pk
+    )
+    auction._cached_now = timezone.now()
     
-    bids = auction.bids.filter(is_deleted=False).order_by('-timestamp')[:10]
+    bids = auction.recent_bids
     user_bids = None
     user_highest_bid = None
-    current_highest_bid = None
     
-    current_highest_bid = auction.bids.filter(is_deleted=False).order_by('-amount').first()
+    current_highest_bid = auction.highest_bid
     
     if current_highest_bid:
         min_bid_amount = current_highest_bid.amount + 1
@@ -124,8 +137,8 @@ def auction_detail(request, pk):
         min_bid_amount = auction.starting_price
     
     if request.user.is_authenticated:
-        user_bids = auction.bids.filter(bidder=request.user, is_deleted=False).order_by('-timestamp')
-        user_highest_bid = user_bids.first()
+        user_bids = list(auction.bids.filter(bidder=request.user, is_deleted=False).order_by('-timestamp'))
+        user_highest_bid = max(user_bids, key=lambda bid: bid.amount, default=None)
     
     context = {
         'auction': auction,
@@ -148,7 +161,7 @@ def place_bid(request, pk):
         messages.error(request, 'This auction is no longer active.')
         return redirect('auction_detail', pk=pk)
     
-    if request.user == auction.seller:
+    if auction.seller_id == request.user.id:
         messages.error(request, 'You cannot bid on your own auction.')
         return redirect('auction_detail', pk=pk)
     
@@ -157,7 +170,8 @@ def place_bid(request, pk):
         if form.is_valid():
             bid_amount = form.cleaned_data['amount']
             
-            wallet, created = Wallet.objects.get_or_create(user=request.user)
+            # Every user gets a wallet on signup (accounts.create_user_wallet), so a plain get is enough
+            wallet = Wallet.objects.get(user=request.user)
             
             if not wallet.has_sufficient_balance(bid_amount):
                 messages.error(request, f'Insufficient wallet balance. You need ₹{bid_amount} but have ₹{wallet.balance}. Please add funds to your wallet.')
@@ -165,6 +179,24 @@ def place_bid(request, pk):
             
             try:
                 with transaction.atomic():
+                    bid = Bid.objects.create(
+                        item=auction,
+                        bidder=request.user,
+                        amount=bid_amount
+                    )
+                    
+                    # Guarded UPDATE: claims the new price and records this bid as the leader only if
+                    # the auction is still open and no equal or higher bid landed since the form was validated
+                    outbid = Q(current_price__lt=bid_amount) | Q(highest_bid__isnull=True, starting_price__lte=bid_amount)
+                    updated = AuctionItem.objects.filter(
+                        outbid,
+                        pk=pk,
+                        status__in=AuctionItem.OPEN_STATUSES,
+                        end_time__gt=timezone.now()
+                    ).update(current_price=bid_amount, highest_bid=bid.pk, bid_count=F('bid_count') + 1)
+                    if not updated:
+                        raise ValueError('A higher bid has already been placed or the auction has ended.')
+                    
                     new_balance = wallet.deduct_funds(bid_amount)
                     
                     WalletTransaction.objects.create(
@@ -175,14 +207,7 @@ def place_bid(request, pk):
                         description=f'Bid placed on {auction.title}'
                     )
                     
-                    Bid.objects.create(
-                        item=auction,
-                        bidder=request.user,
-                        amount=bid_amount
-                    )
-                    
-                    auction.current_price = bid_amount
-                    auction.save()
+                    transaction.on_commit(lambda: cache.delete(recent_bids_cache_key(pk)))
                     
                     messages.success(request, f'Your bid of ₹{bid_amount} has been placed successfully! Funds deducted from your wallet.')
                     
@@ -207,7 +232,15 @@ def delete_bid(request, bid_id):
         
         try:
             with transaction.atomic():
-                wallet, created = Wallet.objects.get_or_create(user=request.user)
+                # Lock the auction row so the leader cannot change while this bid is withdrawn
+                leader_id = AuctionItem.objects.select_for_update().values_list('highest_bid_id', flat=True).get(pk=bid.item_id)
+                if leader_id == bid.pk:
+                    raise ValueError('This bid is currently the highest bid.')
+                
+                if not bid.soft_delete():
+                    raise ValueError('This bid has already been deleted.')
+                
+                wallet = Wallet.objects.get(user=request.user)
                 
                 new_balance = wallet.add_funds(bid.amount)
                 
@@ -219,7 +252,8 @@ def delete_bid(request, bid_id):
                     description=f'Bid refund for {bid.item.title}'
                 )
                 
-                bid.soft_delete()
+                transaction.on_commit(lambda: cache.delete(recent_bids_cache_key(bid.item_id)))
+                
                 messages.success(request, f'Your bid of ₹{bid.amount} has been successfully deleted and refunded to your wallet.')
                 
         except ValueError as e:
@@ -231,7 +265,7 @@ def delete_bid(request, bid_id):
     context = {
         'bid': bid,
         'can_delete': bid.can_be_deleted(),
-        'is_highest': bid == bid.item.bids.filter(is_deleted=False).order_by('-amount').first()
+        'is_highest': bid.pk == bid.item.highest_bid_id
     }
     return render(request, 'auctions/delete_bid.html', context)
 
@@ -268,8 +302,8 @@ def extend_auction_time(request, pk):
             auction.end_time = new_end_time
             auction.time_extensions += 1
             if auction.time_extensions > 0:
-                auction.status = 'extended'
-            auction.save()
+                auction.status = AuctionItem.EXTENDED
+            auction.save(update_fields=['end_time', 'time_extensions', 'status'])
             
             messages.success(request, f'Auction extended by {extension_hours} hours successfully!')
             return redirect('auction_detail', pk=pk)
@@ -281,7 +315,13 @@ def extend_auction_time(request, pk):
 
 @login_required
 def delete_auction(request, pk):
-    auction = get_object_or_404(AuctionItem, pk=pk, seller=request.user)
+    auction = get_object_or_404(
+        AuctionItem.objects.annotate(
+            has_bids=Exists(Bid.objects.filter(item=OuterRef('pk'), is_deleted=False))
+        ),
+        pk=pk,
+        seller=request.user
+    )
     
     if not auction.can_be_deleted_by_seller():
         messages.error(request, 'This auction cannot be deleted. Either the time limit has passed (10 minutes) or there are existing bids.')
@@ -289,7 +329,18 @@ def delete_auction(request, pk):
     
     if request.method == 'POST':
         auction_title = auction.title
-        auction.delete()
+        # Re-check the conditions in the DELETE itself so a bid placed meanwhile keeps the auction
+        deleted, _ = AuctionItem.objects.filter(
+            pk=pk,
+            seller=request.user,
+            status=AuctionItem.ACTIVE,
+            created_at__gt=timezone.now() - timedelta(minutes=10)
+        ).exclude(
+            Exists(Bid.objects.filter(item=OuterRef('pk'), is_deleted=False))
+        ).delete()
+        if not deleted:
+            messages.error(request, 'This auction cannot be deleted. Either the time limit has passed (10 minutes) or there are existing bids.')
+            return redirect('auction_detail', pk=pk)
         messages.success(request, f'Auction "{auction_title}" has been deleted successfully.')
         return redirect('my_auctions')
     
@@ -319,16 +370,26 @@ def create_auction(request):
     return render(request, 'auctions/create_auction.html', {'form': form})
 
 
+def _auction_card_qs(queryset):
+    """Load the columns and related rows an auction card renders"""
+    return queryset.select_related('seller', 'winner').only(
+        *AUCTION_CARD_FIELDS, 'starting_price', 'time_extensions', 'bid_count',
+        'seller__username', 'winner__username'
+    )
+
+
 @login_required
 def my_auctions(request):
-    auto_close_expired_auctions()
+    maybe_close_expired_auctions()
     
-    selling = AuctionItem.objects.filter(seller=request.user).order_by('-created_at')
-    bidding = AuctionItem.objects.filter(
-        bids__bidder=request.user, 
-        bids__is_deleted=False
-    ).distinct().order_by('-created_at')
-    won_auctions = AuctionItem.objects.filter(winner=request.user).order_by('-end_time')
+    selling = _auction_card_qs(AuctionItem.objects.filter(seller=request.user)).annotate(
+        has_bids=Exists(Bid.objects.filter(item=OuterRef('pk'), is_deleted=False))
+    ).order_by('-created_at')
+    # Semi-join instead of JOIN + DISTINCT over every bid the user placed
+    bidding = _auction_card_qs(AuctionItem.objects.filter(
+        Exists(Bid.objects.filter(item=OuterRef('pk'), bidder=request.user, is_deleted=False))
+    )).order_by('-created_at')
+    won_auctions = _auction_card_qs(AuctionItem.objects.filter(winner=request.user)).order_by('-end_time')
     
     context = {
         'selling': selling,
@@ -341,22 +402,27 @@ def my_auctions(request):
 @login_required
 def get_auction_status(request, pk):
     """AJAX endpoint to get real-time auction status"""
-    auction = get_object_or_404(AuctionItem, pk=pk)
-    
-    if auction.status == 'active' and timezone.now() >= auction.end_time:
-        auction.status = 'closed'
-        highest_bid = auction.bids.filter(is_deleted=False).order_by('-amount').first()
-        if highest_bid:
-            auction.winner = highest_bid.bidder
-        auction.save()
-    
-    data = {
-        'status': auction.status,
-        'current_price': float(auction.current_price),
-        'time_remaining': auction.time_remaining().total_seconds() if auction.time_remaining() else 0,
-        'bid_count': auction.bids.filter(is_deleted=False).count(),
-        'is_active': auction.is_active(),
-    }
+    def build_status():
+        auction = get_object_or_404(AuctionItem, pk=pk)
+        
+        if auction.status in AuctionItem.OPEN_STATUSES and timezone.now() >= auction.end_time:
+            # Close through the sweep so the winner is set and the seller is paid
+            closed = auto_close_expired_auctions()
+            if auction.pk in closed:
+                auction.status = AuctionItem.CLOSED
+                auction.winner_id = closed[auction.pk]
+        
+        time_remaining = auction.time_remaining()
+        return {
+            'status': auction.get_status_display().lower(),
+            'current_price': float(auction.current_price),
+            'time_remaining': time_remaining.total_seconds() if time_remaining else 0,
+            'bid_count': auction.bid_count,
+            'is_active': auction.is_active(),
+        }
+    
+    # Pollers of the same auction share one payload for STATUS_CACHE_TIMEOUT seconds
+    data = cache.get_or_set(f'auction_status:{pk}', build_status, STATUS_CACHE_TIMEOUT)
     
     return JsonResponse(data)
 
@@ -364,22 +430,43 @@ def get_auction_status(request, pk):
 @login_required
 def get_recent_bids(request, pk):
     """AJAX endpoint to get recent bids for live updates"""
-    auction = get_object_or_404(AuctionItem, pk=pk)
-    recent_bids = auction.bids.filter(is_deleted=False).order_by('-timestamp')[:5]
+    def build_recent_bids():
+        auction = get_object_or_404(AuctionItem, pk=pk)
+        recent_bids = auction.bids.filter(is_deleted=False).order_by('-timestamp').values(
+            'bidder_id', 'bidder__username', 'amount', 'timestamp'
+        )[:5]
+        return [
+            {
+                'bidder_id': bid['bidder_id'],
+                'bidder': bid['bidder__username'],
+                'amount': float(bid['amount']),
+                'timestamp': bid['timestamp'].isoformat(),
+            }
+            for bid in recent_bids
+        ]
+    
+    # The bid list is shared between pollers; only is_current_user depends on the request
+    recent_bids = cache.get_or_set(recent_bids_cache_key(pk), build_recent_bids, RECENT_BIDS_CACHE_TIMEOUT)
     
     bids_data = []
     for bid in recent_bids:
         bids_data.append({
-            'bidder': bid.bidder.username,
-            'amount': float(bid.amount),
-            'timestamp': bid.timestamp.isoformat(),
-            'is_current_user': bid.bidder == request.user,
+            'bidder': bid['bidder'],
+            'amount': bid['amount'],
+            'timestamp': bid['timestamp'],
+            'is_current_user': bid['bidder_id'] == request.user.id,
         })
 
     return JsonResponse({'bids': bids_data})
+
+
 @login_required
 def manage_auction(request, pk):
-    auction = get_object_or_404(AuctionItem, pk=pk, seller=request.user)
+    auction = get_object_or_404(
+        AuctionItem.objects.select_related('highest_bid__bidder'),
+        pk=pk,
+        seller=request.user
+    )
     
     if request.method == 'POST':
         action = request.POST.get('action')
@@ -388,22 +475,18 @@ def manage_auction(request, pk):
             new_description = request.POST.get('description')
             if new_description:
                 auction.description = new_description
-                auction.save()
+                auction.save(update_fields=['description'])
                 messages.success(request, 'Description updated successfully!')
         
         elif action == 'update_image':
             if 'image' in request.FILES:
                 auction.image = request.FILES['image']
-                auction.save()
+                auction.save(update_fields=['image'])
                 messages.success(request, 'Image updated successfully!')
         
         elif action == 'end_auction':
-            if auction.status == 'active':
-                auction.status = 'closed'
-                highest_bid = auction.bids.filter(is_deleted=False).order_by('-amount').first()
-                if highest_bid:
-                    auction.winner = highest_bid.bidder
-                auction.save()
+            # Closes through the same path as the expiry sweep, so the seller is paid here too
+            if auction.status == AuctionItem.ACTIVE and close_auction(auction.pk):
                 messages.success(request, 'Auction ended successfully!')
             else:
                 messages.error(request, 'Can only end active auctions.')